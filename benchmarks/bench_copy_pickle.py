@@ -0,0 +1,58 @@
+"""
+Compare deep copies and pickling of models with pydantic's own BaseModel.
+
+Deep copies share the values of fields that are immutable all the way down
+(here, `y` and `z`) instead of copying them element by element. Pickling
+restores values as they are, without validation, for both.
+
+Run with: python benchmarks/bench_copy_pickle.py
+"""
+
+import pickle
+from timeit import timeit
+from typing import Dict, List, Tuple
+
+import pydantic
+
+from extra_pydantic import BaseModel
+
+
+class Model(BaseModel):
+    class Config:
+        arbitrary_types_allowed = True
+
+    x: List[Dict[str, int]]
+    y: Tuple[int, ...]
+    z: Tuple[Tuple[str, float], ...]
+
+
+class PydanticModel(pydantic.BaseModel):
+    x: List[Dict[str, int]]
+    y: Tuple[int, ...]
+    z: Tuple[Tuple[str, float], ...]
+
+
+PAYLOAD = {
+    "x": [{str(i): i for i in range(10)} for _ in range(100)],
+    "y": list(range(50_000)),
+    "z": [(str(i), i) for i in range(10_000)],
+}
+
+
+def main(number: int = 20) -> None:
+    for cls in (PydanticModel, Model):
+        m = cls(**PAYLOAD)
+        data = pickle.dumps(m)
+        # access the copied values too, so that no work can be deferred
+        copy = timeit(lambda: m.copy(deep=True).z, number=number) / number
+        validate = timeit(lambda: cls(**PAYLOAD), number=number) / number
+        load = timeit(lambda: pickle.loads(data), number=number) / number
+        print(
+            f"{cls.__name__:>13}: validate {validate * 1e3:8.3f} ms, "
+            f"copy(deep=True) + access {copy * 1e3:7.3f} ms, "
+            f"pickle.loads {load * 1e3:7.3f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -9,7 +9,26 @@ except PackageNotFoundError:
 __author__ = "Talley Lambert"
 __email__ = "talley.lambert@gmail.com"
 
-from .main import BaseModel, ModelMetaclass, create_model
+from .converters import register_converter, unregister_converter
+from .main import (
+    BaseModel,
+    ModelCache,
+    ModelMetaclass,
+    cached_create_model,
+    create_model,
+)
 from .monkeypatch import patched_pydantic_base_model
+from .sampling import ValidationSample, sampled_validation
 
-__all__ = ["BaseModel", "ModelMetaclass", "create_model", "patched_pydantic_base_model"]
+__all__ = [
+    "BaseModel",
+    "ModelCache",
+    "ModelMetaclass",
+    "ValidationSample",
+    "cached_create_model",
+    "create_model",
+    "patched_pydantic_base_model",
+    "register_converter",
+    "sampled_validation",
+    "unregister_converter",
+]
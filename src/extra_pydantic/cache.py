@@ -0,0 +1,140 @@
+import threading
+from collections import OrderedDict
+from dataclasses import is_dataclass
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Callable, Dict, Hashable, List, NamedTuple, Optional
+
+from .sampling import get_validation_sample
+
+__all__ = ["CacheInfo", "ValidationCache", "is_immutable_type"]
+
+_IMMUTABLE_TYPES = {
+    type(None),
+    bool,
+    int,
+    float,
+    complex,
+    str,
+    bytes,
+    Decimal,
+    tuple,
+    frozenset,
+    type(Ellipsis),
+}
+_IMMUTABLE_BASES = (int, float, complex, str, bytes, tuple, frozenset)
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: Optional[int]
+    currsize: int
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+def is_immutable_type(type_: Any) -> bool:
+    """
+    Whether instances of type_ can safely be shared once validated.
+
+    Subclasses of immutable builtins only qualify if they do not add an
+    instance `__dict__` (i.e: they define `__slots__ = ()`).
+    """
+    if not isinstance(type_, type):
+        return False
+    if type_ in _IMMUTABLE_TYPES or issubclass(type_, Enum):
+        return True
+    if is_dataclass(type_):
+        return bool(type_.__dataclass_params__.frozen)  # type: ignore
+    return issubclass(type_, _IMMUTABLE_BASES) and not type_.__dictoffset__
+
+
+def _cache_key(v: Any) -> Hashable:
+    """
+    Hashable key for v, which also tells apart equal values of different types.
+
+    Floats and decimals are keyed on their exact representation, so that equal
+    but distinct inputs (e.g: -0.0 and 0.0, 1.0 and 1.00) are not mixed up and
+    NaNs can be found again.
+    Raises TypeError if v is not hashable.
+    """
+    if isinstance(v, tuple):
+        return (type(v), tuple(_cache_key(x) for x in v))
+    if isinstance(v, frozenset):
+        return (type(v), frozenset(_cache_key(x) for x in v))
+    if isinstance(v, float):
+        return (type(v), float.__repr__(v))
+    if isinstance(v, complex):
+        return (type(v), complex.__repr__(v))
+    if isinstance(v, Decimal):
+        return (type(v), Decimal.as_tuple(v))
+    hash(v)
+    return (type(v), v)
+
+
+class ValidationCache:
+    """
+    Bounded LRU cache mapping hashable inputs of a field to their validated value.
+
+    Only meant for fields whose validated values are immutable, since the same
+    object is returned for every equal input. Unhashable inputs, and inputs
+    validated in sampling mode, bypass the cache.
+    """
+
+    def __init__(self, maxsize: int = 128) -> None:
+        self.maxsize = maxsize
+        self._results: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._hits = 0
+        self._misses = 0
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "ValidationCache":
+        # pydantic deep-copies inherited fields, whose validators still use this cache
+        return self
+
+    def wrap(self, validators: List[Callable]) -> Callable:
+        """Return a single validator running validators on cache misses only."""
+
+        def cached_validators(
+            cls: Any, v: Any, values: Any, field: Any, config: Any
+        ) -> Any:
+            try:
+                # sampled results are only partially validated, never share them
+                if get_validation_sample(field) is not None:
+                    raise TypeError
+                key = _cache_key(v)
+            except TypeError:
+                for validator in validators:
+                    v = validator(cls, v, values, field, config)
+                return v
+
+            with self._lock:
+                if key in self._results:
+                    self._hits += 1
+                    self._results.move_to_end(key)
+                    return self._results[key]
+                self._misses += 1
+
+            for validator in validators:
+                v = validator(cls, v, values, field, config)
+
+            with self._lock:
+                self._results[key] = v
+                if len(self._results) > self.maxsize:
+                    self._results.popitem(last=False)
+            return v
+
+        return cached_validators
+
+    def cache_info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self.maxsize, len(self._results))
+
+    def cache_clear(self) -> None:
+        with self._lock:
+            self._results.clear()
+            self._hits = self._misses = 0
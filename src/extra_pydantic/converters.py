@@ -0,0 +1,84 @@
+from typing import Any, Callable, Dict, Optional, Tuple, Type, TypeVar, overload
+from weakref import WeakKeyDictionary
+
+__all__ = ["find_converter", "register_converter", "unregister_converter"]
+
+T = TypeVar("T")
+Converter = Callable[[Any, Type[T]], T]
+
+# user-registered converters, keyed on (source type, target type)
+_CONVERTERS: Dict[Tuple[type, type], Converter] = {}
+# resolved converter for each concrete source type, then target type seen so far;
+# None is cached as well, so pairs without a converter are only resolved once.
+# Types are only weakly referenced, so that dynamically created ones can be freed
+_DISPATCH_CACHE: "WeakKeyDictionary[type, WeakKeyDictionary[type, Any]]" = (
+    WeakKeyDictionary()
+)
+
+
+@overload
+def register_converter(
+    source: type, target: type
+) -> Callable[[Converter], Converter]: ...
+
+
+@overload
+def register_converter(source: type, target: type, func: Converter) -> Converter: ...
+
+
+def register_converter(source: type, target: type, func: Any = None) -> Any:
+    """
+    Register a function converting instances of `source` into `target`.
+
+    The converter is called as `func(value, type_)`, where `type_` is the
+    concrete type being validated: it also applies to subclasses of both
+    `source` and `target`, the closest registration along the MROs
+    (target first) taking precedence. Pairs without a converter keep being
+    coerced by passing the value to the type.
+    For parametrized targets (e.g: `MyList[float]`), the converter receives the
+    raw input and its result is trusted: elements are not validated one by one.
+    Can be used as a decorator when `func` is omitted.
+    """
+
+    def _register(func: Converter) -> Converter:
+        _CONVERTERS[(source, target)] = func
+        _DISPATCH_CACHE.clear()
+        return func
+
+    return _register(func) if func is not None else _register
+
+
+def unregister_converter(source: type, target: type) -> None:
+    """Remove the converter registered for exactly (source, target), if any."""
+    if _CONVERTERS.pop((source, target), None) is not None:
+        _DISPATCH_CACHE.clear()
+
+
+def find_converter(source: type, target: type) -> Optional[Converter]:
+    """Return the converter to use from `source` to `target`, or None."""
+    if not _CONVERTERS:
+        return None
+    try:
+        cached: Optional[Converter] = _DISPATCH_CACHE[source][target]
+        return cached
+    except KeyError:
+        pass
+    except TypeError:
+        # not weakly referenceable, resolve every time
+        return _resolve_converter(source, target)
+
+    converter = _resolve_converter(source, target)
+    try:
+        _DISPATCH_CACHE.setdefault(source, WeakKeyDictionary())[target] = converter
+    except TypeError:
+        pass
+    return converter
+
+
+def _resolve_converter(source: type, target: type) -> Optional[Converter]:
+    for t in getattr(target, "__mro__", (target,)):
+        for s in source.__mro__:
+            converter = _CONVERTERS.get((s, t))
+            if converter is not None:
+                return converter
+    return None
@@ -1,20 +1,31 @@
 from contextlib import contextmanager
 from dataclasses import is_dataclass
 from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
     Generic,
     Iterable,
     Iterator,
+    List,
     Mapping,
+    Optional,
     Tuple,
     Type,
     get_args,
     get_origin,
 )
+from weakref import WeakKeyDictionary
 
 import pydantic.config
 import pydantic.fields
 import pydantic.validators
+from pydantic.typing import is_union
 
+from .cache import ValidationCache, is_immutable_type
+from .nested import ValidationPlan, compile_plan, nested_casting_validator
+from .unions import UnionDiscriminator
 from .validators import (
     coerce_dataclass_validator,
     element_casting_validator,
@@ -23,43 +34,136 @@ from .validators import (
     tuple_element_casting_validator,
 )
 
+if TYPE_CHECKING:
+    from pydantic.fields import LocStr, ValidateReturn
+    from pydantic.types import ModelOrDc
+
 __all__ = ["ModelField"]
 
 
+# validators for the generics below take precedence over pydantic's builtin ones
+_GENERIC_VALIDATORS: List[
+    Tuple[Any, Callable[[pydantic.fields.ModelField], List[Callable]]]
+] = [
+    (type(Ellipsis), lambda f: []),  # so the ellipsis type does not mess up things
+    (
+        Mapping,
+        lambda f: [mapping_casting_validator(f), simple_casting_validator(f.type_)],
+    ),
+    (
+        Tuple,
+        lambda f: [
+            tuple_element_casting_validator(f),
+            simple_casting_validator(f.type_),
+        ],
+    ),
+    (
+        Iterable,
+        lambda f: [element_casting_validator(f), simple_casting_validator(f.type_)],
+    ),
+    (Generic, lambda f: [simple_casting_validator(f.type_)]),
+]
+
+# index of the first entry of _GENERIC_VALIDATORS + pydantic.validators._VALIDATORS
+# matching each type (-1 if none), valid as long as the builtin table is the same.
+# Types are only weakly referenced, so that dynamically created models can be freed
+_validator_index: "WeakKeyDictionary[Any, int]" = WeakKeyDictionary()
+# fallback for the (few) hashable types that do not support weak references
+_unweakrefable_index: Dict[Any, int] = {}
+_indexed_builtins: List[Any] = []
+# pydantic's own table, while `extended_bultin_validators` has patched it
+_unpatched_builtins: Optional[List[Any]] = None
+
+
+def _cached_index(type_: Any) -> int:
+    """Return the cached index of type_. Raises KeyError if missing."""
+    try:
+        return _validator_index[type_]
+    except TypeError:
+        return _unweakrefable_index[type_]
+
+
+def _cache_index(type_: Any, index: int) -> None:
+    try:
+        _validator_index[type_] = index
+    except TypeError:
+        _unweakrefable_index[type_] = index
+
+
+def validator_index(type_: Any, builtins: Optional[List[Any]] = None) -> Optional[int]:
+    """
+    Return the position of the validators entry to use for type_.
+
+    Positions count the generic entries first, then pydantic's builtin ones
+    (the unpatched `pydantic.validators._VALIDATORS` by default).
+    The lookup is resolved along the MRO once per type and cached; returns
+    None if the type cannot be indexed (unhashable or not a class).
+    """
+    global _indexed_builtins
+    if builtins is None:
+        builtins = _unpatched_builtins
+        if builtins is None:
+            builtins = pydantic.validators._VALIDATORS
+    if builtins is not _indexed_builtins:
+        _validator_index.clear()
+        _unweakrefable_index.clear()
+        _indexed_builtins = builtins
+
+    try:
+        return _cached_index(type_)
+    except KeyError:
+        pass
+    except TypeError:
+        return None
+
+    index = -1
+    try:
+        for i, (val_type, _) in enumerate([*_GENERIC_VALIDATORS, *builtins]):
+            if issubclass(type_, val_type):
+                index = i
+                break
+    except TypeError:
+        return None
+    _cache_index(type_, index)
+    return index
+
+
 @contextmanager
 def extended_bultin_validators(field: pydantic.fields.ModelField) -> Iterator[None]:
     """
-    Prepend a few custom validators to pydantic.validators._VALIDATORS.
-    This ensures that our validators are called first if the field type
-    matches one of the generics below.
+    Put the validators entry matching the field type first in pydantic's table.
+
+    Our validators are used first if the field type matches one of the generics
+    in _GENERIC_VALIDATORS, and pydantic's builtin ones otherwise. The matching
+    entry is looked up in an index, so that `find_validators` stops at the first
+    entry for this field. Pydantic's builtin entries stay in the table, since
+    populating a field can create other fields (e.g: for stdlib dataclasses).
     """
-    v = [
-        (type(Ellipsis), []),  # so the ellipsis type does not mess up things
-        (
-            Mapping,
-            [mapping_casting_validator(field), simple_casting_validator(field.type_)],
-        ),
-        (
-            Tuple,
-            [
-                tuple_element_casting_validator(field),
-                simple_casting_validator(field.type_),
-            ],
-        ),
-        (
-            Iterable,
-            [element_casting_validator(field), simple_casting_validator(field.type_)],
-        ),
-        (Generic, [simple_casting_validator(field.type_)]),
-    ]
-    before, pydantic.validators._VALIDATORS = (
-        pydantic.validators._VALIDATORS,
-        v + pydantic.validators._VALIDATORS,
-    )
+    global _unpatched_builtins
+    before = pydantic.validators._VALIDATORS
+    outer_builtins = _unpatched_builtins
+    # nested calls must see pydantic's table, not the one patched by their parent
+    builtins = before if outer_builtins is None else outer_builtins
+    index = validator_index(field.type_, builtins)
+    n_generic = len(_GENERIC_VALIDATORS)
+    if index is None:
+        # let pydantic go through (and fail on) the whole table
+        table = [(t, make(field)) for t, make in _GENERIC_VALIDATORS] + builtins
+    elif index < 0:
+        table = builtins
+    elif index < n_generic:
+        val_type, make = _GENERIC_VALIDATORS[index]
+        table = [(val_type, make(field)), *builtins]
+    else:
+        table = [builtins[index - n_generic], *builtins]
+
+    pydantic.validators._VALIDATORS = table
+    _unpatched_builtins = builtins
     try:
         yield
     finally:
         pydantic.validators._VALIDATORS = before
+        _unpatched_builtins = outer_builtins
 
 
 # patched ModelField that:
@@ -69,8 +173,39 @@ def extended_bultin_validators(field: pydantic.fields.ModelField) -> Iterator[No
 # NOTE: root validators with `pre=False` *still* run after the type coercion
 
 
+def has_immutable_values(field: pydantic.fields.ModelField) -> bool:
+    """Whether the validated values of a field are immutable, all the way down."""
+    sub_fields = field.sub_fields or []
+    if field.shape == pydantic.fields.SHAPE_SINGLETON:
+        if sub_fields:  # union
+            return all(has_immutable_values(f) for f in sub_fields)
+        return is_immutable_type(field.type_)
+    if field.shape == pydantic.fields.SHAPE_GENERIC:
+        return is_immutable_type(field.type_) and all(
+            has_immutable_values(f) for f in sub_fields
+        )
+    if field.shape in (
+        pydantic.fields.SHAPE_TUPLE,
+        pydantic.fields.SHAPE_TUPLE_ELLIPSIS,
+        pydantic.fields.SHAPE_FROZENSET,
+    ):
+        return all(has_immutable_values(f) for f in sub_fields)
+    return False
+
+
 class ModelField(pydantic.fields.ModelField):
+    plan: Optional[ValidationPlan] = None
+    # opt-in with `Field(validation_cache=maxsize)`, for immutable values only
+    validation_cache: Optional[ValidationCache] = None
+    # set on fields created for the parameters of another field
+    is_sub_field: bool = False
+    # set on unions with generic container members
+    union_discriminator: Optional[UnionDiscriminator] = None
+
     def populate_validators(self) -> None:
+        # inherited fields are copies, repopulated when subclasses add validators
+        self.validation_cache = None
+        self.union_discriminator = None
         with extended_bultin_validators(self):
             super().populate_validators()
             # override self.validators generation, cause we need *both* class
@@ -99,6 +234,58 @@ class ModelField(pydantic.fields.ModelField):
                     )
                 )
 
+            # nested generics are walked iteratively by a single validator,
+            # instead of recursing through each sub-field's `validate`
+            self.plan = compile_plan(self)
+            if self.plan.depth > 1:
+                self.validators = pydantic.class_validators.prep_validators(
+                    [nested_casting_validator(self.plan)]
+                )
+
+            maxsize = self.field_info.extra.get("validation_cache")
+            if (
+                maxsize
+                and not self.class_validators
+                # other shapes do not go through self.validators
+                and (
+                    self.shape == pydantic.fields.SHAPE_GENERIC
+                    or (
+                        self.shape == pydantic.fields.SHAPE_SINGLETON
+                        and not self.sub_fields
+                    )
+                )
+                and has_immutable_values(self)
+            ):
+                self.validation_cache = ValidationCache(
+                    128 if maxsize is True else maxsize
+                )
+                self.validators = [self.validation_cache.wrap(self.validators)]
+
+            if (
+                self.shape == pydantic.fields.SHAPE_SINGLETON
+                and is_union(get_origin(self.type_))
+                and self.discriminator_key is None
+                and not self.model_config.smart_union
+            ):
+                self.union_discriminator = UnionDiscriminator.from_field(self)
+
+    def _validate_singleton(
+        self,
+        v: Any,
+        values: Dict[str, Any],
+        loc: "LocStr",
+        cls: Optional["ModelOrDc"],
+    ) -> "ValidateReturn":
+        if self.union_discriminator is not None:
+            candidates = self.union_discriminator.candidates(v)
+            if candidates is not None:
+                for field in candidates:
+                    value, error = field.validate(v, values, loc=loc, cls=cls)
+                    if not error:
+                        return value, None
+                # fall back to trying every member, to collect all the errors
+        return super()._validate_singleton(v, values, loc, cls)
+
     def _type_analysis(self) -> None:
         origin = get_origin(self.outer_type_)
         if (
@@ -117,3 +304,7 @@ class ModelField(pydantic.fields.ModelField):
                 self._create_sub_type(t, f"{self.name}_{i}") for i, t in enumerate(args)
             ]
             self.type_: Type = origin
+
+        for f in [*(self.sub_fields or []), self.key_field]:
+            if isinstance(f, ModelField):
+                f.is_sub_field = True
@@ -1,12 +1,34 @@
-from typing import Any, Type, no_type_check
+import inspect
+import threading
+import weakref
+from collections import OrderedDict
+from functools import wraps
+from types import MethodType
+from typing import (
+    Any,
+    Callable,
+    ClassVar,
+    Dict,
+    FrozenSet,
+    Hashable,
+    Optional,
+    Set,
+    Type,
+    no_type_check,
+)
 
 import pydantic.main
+from pydantic import PrivateAttr
+from pydantic.fields import FieldInfo, Undefined
 
+from .cache import CacheInfo
+from .fields import has_immutable_values
 from .monkeypatch import (
     patched_dataclass_validator,
     patched_pydantic_base_model,
     patched_pydantic_model_field,
 )
+from .sampling import can_be_sampled, get_call_sample, recording_sampled_fields
 
 _is_base_model_class_defined = False
 
@@ -27,11 +49,127 @@ class ModelMetaclass(pydantic.main.ModelMetaclass):
                 raise ValueError(
                     "arbitrary_types_allowed must be True for extra_pydantic to work"
                 )
+            if _is_base_model_class_defined:
+                # pydantic does not inherit private attributes from the root model,
+                # which our BaseModel is while patched in (e.g: in create_model)
+                for k, v in BaseModel.__private_attributes__.items():
+                    new_cls.__private_attributes__.setdefault(k, v)
+                _setup_sampling(new_cls, namespace)
+                new_cls.__shared_on_copy__ = frozenset(
+                    name
+                    for name, f in new_cls.__fields__.items()
+                    if has_immutable_values(f)
+                )
             return new_cls
 
 
 class BaseModel(pydantic.main.BaseModel, metaclass=ModelMetaclass):
-    pass
+    # names of the fields whose elements were only partially validated
+    # (only tracked by models with fields that can be sampled, see `_setup_sampling`)
+    __sampled_fields__: FrozenSet[str] = PrivateAttr(default=frozenset())
+    # whether some fields always sample-validate, set by the metaclass
+    __sampled_validation__: ClassVar[bool] = False
+
+    # fields whose validated values are immutable, set by the metaclass
+    __shared_on_copy__: ClassVar[FrozenSet[str]] = frozenset()
+
+    def _copy_and_set_values(
+        self, values: Dict[str, Any], fields_set: Set[str], *, deep: bool
+    ) -> "BaseModel":
+        # deep copies share immutable values instead of copying them element-wise,
+        # as long as they are the validated ones (not passed with `update`)
+        shared = self.__shared_on_copy__ if deep else ()
+        current = self.__dict__
+        kept = {
+            k: v
+            for k, v in values.items()
+            if k in shared and v is current.get(k, Undefined)
+        }
+        if not kept:
+            return super()._copy_and_set_values(values, fields_set, deep=deep)
+        m = super()._copy_and_set_values(
+            {k: v for k, v in values.items() if k not in kept}, fields_set, deep=deep
+        )
+        copied = m.__dict__
+        object.__setattr__(
+            m, "__dict__", {k: kept[k] if k in kept else copied[k] for k in values}
+        )
+        return m
+
+    def __getattr__(self, name: str) -> Any:
+        # only reached if the private attribute was never set
+        if name == "__sampled_fields__":
+            return frozenset()
+        raise AttributeError(
+            f"{type(self).__name__!r} object has no attribute {name!r}"
+        )
+
+
+def _setup_sampling(cls: Type[BaseModel], namespace: Dict[str, Any]) -> None:
+    """
+    Make cls record its sample-validated fields, if it has any that can be.
+
+    Other models skip recording altogether, so they do not pay for sampling.
+    """
+    fields = cls.__fields__.values()
+    if not any(can_be_sampled(f) for f in fields):
+        # no per-instance value, `BaseModel.__getattr__` provides the default
+        cls.__private_attributes__.pop("__sampled_fields__", None)
+        return
+
+    cls.__sampled_validation__ = any(
+        f.field_info.extra.get("validation_sample") is not None for f in fields
+    )
+    init = cls.__init__
+    if "__init__" in namespace or not getattr(init, "_records_sampled", False):
+        cls.__init__ = _recording_sampled_init(init)  # type: ignore
+    setattr_ = cls.__setattr__
+    if cls.__config__.validate_assignment and (
+        "__setattr__" in namespace or not getattr(setattr_, "_records_sampled", False)
+    ):
+        cls.__setattr__ = _recording_sampled_setattr(setattr_)  # type: ignore
+
+
+def _recording_sampled_init(init: Callable) -> Callable:
+    @wraps(init)
+    def __init__(__pydantic_self__: BaseModel, *args: Any, **data: Any) -> None:
+        if not __pydantic_self__.__sampled_validation__ and get_call_sample() is None:
+            init(__pydantic_self__, *args, **data)
+            return
+        with recording_sampled_fields() as sampled:
+            init(__pydantic_self__, *args, **data)
+        if sampled:
+            object.__setattr__(
+                __pydantic_self__, "__sampled_fields__", frozenset(sampled)
+            )
+
+    __init__._records_sampled = True  # type: ignore
+    return __init__
+
+
+def _recording_sampled_setattr(setattr_: Callable) -> Callable:
+    @wraps(setattr_)
+    def __setattr__(self: BaseModel, name: str, value: Any) -> None:
+        if (
+            not self.__config__.validate_assignment
+            or name not in self.__fields__
+            or not (
+                self.__sampled_validation__
+                or get_call_sample() is not None
+                or name in self.__sampled_fields__
+            )
+        ):
+            setattr_(self, name, value)
+            return
+        with recording_sampled_fields() as sampled:
+            setattr_(self, name, value)
+        # the new value replaces whatever was recorded for the previous one
+        object.__setattr__(
+            self, "__sampled_fields__", (self.__sampled_fields__ - {name}) | sampled
+        )
+
+    __setattr__._records_sampled = True  # type: ignore
+    return __setattr__
 
 
 _is_base_model_class_defined = True
@@ -40,3 +178,127 @@ _is_base_model_class_defined = True
 def create_model(__model_name: str, **kwargs: Any) -> Type["BaseModel"]:
     with patched_pydantic_base_model():
         return pydantic.main.create_model(__model_name, **kwargs)  # type: ignore
+
+
+def _freeze(obj: Any) -> Hashable:
+    """
+    Return a hashable canonical form of a field definition or config value.
+
+    Raises TypeError if some part of obj cannot be made hashable.
+    """
+    if isinstance(obj, dict):
+        return (dict, frozenset((k, _freeze(v)) for k, v in obj.items()))
+    if isinstance(obj, (list, tuple)):
+        return (type(obj), tuple(_freeze(v) for v in obj))
+    if isinstance(obj, (set, frozenset)):
+        return (frozenset, frozenset(_freeze(v) for v in obj))
+    if isinstance(obj, FieldInfo):
+        # FieldInfo has no value equality, compare what it was created with
+        return (FieldInfo, tuple((k, _freeze(v)) for k, v in obj.__repr_args__()))
+    hash(obj)
+    # the type avoids collisions such as 1 == 1.0 == True
+    return (type(obj), obj)
+
+
+def _freeze_config(config: Any) -> Hashable:
+    """Config classes are usually redefined every time, so compare their content."""
+    if not isinstance(config, type):
+        return _freeze(config)
+    return tuple(
+        (k, _freeze_config_value(getattr(config, k)))
+        for k in dir(config)
+        if not k.startswith("_")
+    )
+
+
+def _freeze_config_value(value: Any) -> Hashable:
+    # classmethods (e.g: BaseConfig.prepare_field) are bound to each config class,
+    # so only compare the underlying function, which is shared when inherited
+    if inspect.ismethod(value):
+        return (MethodType, value.__func__)
+    return _freeze(value)
+
+
+class ModelCache:
+    """
+    Memoized `create_model`, for models generated repeatedly from the same schema.
+
+    Models are keyed on a canonical form of their name, field definitions and
+    config, and the least recently used ones are evicted past `maxsize`
+    (`None` for unbounded). Evicted models are only held by weak reference,
+    so they are reused as long as something else keeps them alive.
+    Definitions that cannot be made hashable are never cached.
+    """
+
+    def __init__(self, maxsize: Optional[int] = 128) -> None:
+        self.maxsize = maxsize
+        self._models: "OrderedDict[Hashable, Type[BaseModel]]" = OrderedDict()
+        self._evicted: "weakref.WeakValueDictionary[Hashable, Type[BaseModel]]" = (
+            weakref.WeakValueDictionary()
+        )
+        self._lock = threading.RLock()
+        self._hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def make_key(__model_name: str, **kwargs: Any) -> Hashable:
+        """Return the canonical cache key for the given create_model arguments."""
+        return (
+            __model_name,
+            frozenset(
+                (k, _freeze_config(v) if k == "__config__" else _freeze(v))
+                for k, v in kwargs.items()
+            ),
+        )
+
+    def create_model(self, __model_name: str, **kwargs: Any) -> Type["BaseModel"]:
+        try:
+            key = self.make_key(__model_name, **kwargs)
+        except TypeError:
+            with self._lock:
+                self._misses += 1
+            return create_model(__model_name, **kwargs)
+
+        with self._lock:
+            model = self._models.get(key)
+            if model is None:
+                model = self._evicted.pop(key, None)
+            if model is not None:
+                self._hits += 1
+                self._store(key, model)
+                return model
+            self._misses += 1
+
+            model = create_model(__model_name, **kwargs)
+            self._store(key, model)
+            return model
+
+    def _store(self, key: Hashable, model: Type["BaseModel"]) -> None:
+        self._models[key] = model
+        self._models.move_to_end(key)
+        if self.maxsize is not None:
+            while len(self._models) > self.maxsize:
+                old_key, old_model = self._models.popitem(last=False)
+                self._evicted[old_key] = old_model
+
+    def cache_info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self.maxsize, len(self._models))
+
+    def cache_clear(self) -> None:
+        with self._lock:
+            self._models.clear()
+            self._evicted.clear()
+            self._hits = self._misses = 0
+
+
+_model_cache = ModelCache()
+
+
+def cached_create_model(__model_name: str, **kwargs: Any) -> Type["BaseModel"]:
+    """Same as `create_model`, but returns the same class for identical arguments."""
+    return _model_cache.create_model(__model_name, **kwargs)
+
+
+cached_create_model.cache_info = _model_cache.cache_info  # type: ignore
+cached_create_model.cache_clear = _model_cache.cache_clear  # type: ignore
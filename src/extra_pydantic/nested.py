@@ -0,0 +1,249 @@
+from __future__ import annotations
+
+from dataclasses import is_dataclass
+from itertools import zip_longest
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+import pydantic.fields
+
+from .converters import find_converter
+from .sampling import get_validation_sample, record_sampled
+from .validators import (
+    CannotCastError,
+    Missing,
+    cast,
+    convert,
+    sampled_elements,
+    sampled_items,
+)
+
+if TYPE_CHECKING:
+    from pydantic.fields import ModelField
+
+__all__ = ["ValidationPlan", "compile_plan", "nested_casting_validator"]
+
+# plan kinds, mirroring the order of the generic entries
+# in `fields.extended_bultin_validators`
+LEAF = 0
+MAPPING = 1
+TUPLE = 2
+ITERABLE = 3
+
+# exceptions turned into validation errors by `ModelField._apply_validators`
+_VALIDATION_ERRORS = (ValueError, TypeError, AssertionError)
+
+
+class ValidationPlan:
+    """
+    Precomputed description of how to validate one level of a generic field.
+
+    Container levels (mapping/tuple/iterable) hold the plans of their elements,
+    so that a whole tree of nested generics can be walked without going through
+    `ModelField.validate` at every depth. Anything that cannot be described
+    this way (unions, class validators, plain types...) is a `LEAF` and is
+    delegated to its own field.
+    """
+
+    __slots__ = (
+        "kind",
+        "field",
+        "type_",
+        "children",
+        "variadic",
+        "is_container",
+        "validators",
+    )
+
+    def __init__(
+        self,
+        kind: int,
+        field: ModelField,
+        children: Sequence[ValidationPlan] = (),
+        variadic: bool = False,
+    ) -> None:
+        self.kind = kind
+        self.field = field
+        self.type_ = field.type_
+        self.children = tuple(children)
+        self.variadic = variadic
+        self.is_container = kind != LEAF
+        # simple leaves get their validators applied directly
+        self.validators: Optional[Tuple[Callable, ...]] = None
+        if (
+            kind == LEAF
+            and field.shape == pydantic.fields.SHAPE_SINGLETON
+            and not field.sub_fields
+            and not field.pre_validators
+            and not field.post_validators
+        ):
+            self.validators = tuple(field.validators)
+
+    @property
+    def depth(self) -> int:
+        """Number of nested container levels covered by this plan."""
+        if not self.is_container:
+            return 0
+        return 1 + max((c.depth for c in self.children), default=0)
+
+
+def _generic_kind(field: ModelField) -> int:
+    """Return the plan kind of a field, or LEAF if it cannot be inlined."""
+    if (
+        field.shape != pydantic.fields.SHAPE_GENERIC
+        or field.class_validators
+        or field.pre_validators
+        or field.post_validators
+        or hasattr(field.type_, "__get_validators__")
+        or is_dataclass(field.type_)
+        or not field.sub_fields
+    ):
+        return LEAF
+    if issubclass(field.type_, Mapping):
+        return MAPPING
+    if issubclass(field.type_, Tuple):  # type: ignore
+        return TUPLE
+    if issubclass(field.type_, Iterable):
+        return ITERABLE
+    # plain generics are only casted, nothing to walk into
+    return LEAF
+
+
+def compile_plan(field: ModelField) -> ValidationPlan:
+    """
+    Build the validation plan of a (fully prepared) field.
+
+    Sub-fields reuse the plans they compiled for themselves, if any.
+    """
+    kind = _generic_kind(field)
+    if kind == LEAF:
+        return ValidationPlan(kind, field)
+
+    children = [getattr(f, "plan", None) or compile_plan(f) for f in field.sub_fields]
+    if kind == MAPPING:
+        if len(children) != 2:
+            # let the regular validators raise the appropriate error
+            return ValidationPlan(LEAF, field)
+        return ValidationPlan(kind, field, children)
+    if kind == TUPLE:
+        if len(children) == 2 and children[1].type_ is type(Ellipsis):
+            return ValidationPlan(kind, field, children[:1], variadic=True)
+        return ValidationPlan(kind, field, children)
+    return ValidationPlan(kind, field, children, variadic=len(children) == 1)
+
+
+def _iter_children(plan: ValidationPlan, v: Any) -> Iterator[Tuple[Any, Any, int]]:
+    """Yield (plan, value, loc) for each element of v that must be validated."""
+    if plan.kind == MAPPING:
+        f_key, f_val = plan.children
+        for i, (k_, v_) in enumerate(v.items()):
+            yield f_key, k_, i
+            yield f_val, v_, i
+    elif plan.variadic:
+        f = plan.children[0]
+        for i, v_ in enumerate(v):
+            yield f, v_, i
+    else:
+        for i, (v_, f) in enumerate(zip_longest(v, plan.children, fillvalue=Missing)):
+            if v_ is Missing or f is Missing:
+                raise ValueError(
+                    "args must be either a single one, "
+                    "or as many as there are elements"
+                )
+            yield f, v_, i
+
+
+def _finish(plan: ValidationPlan, result: List[Any]) -> Any:
+    """Build the final (casted) container from the validated elements."""
+    if plan.kind == MAPPING:
+        it = iter(result)
+        v: Any = dict(zip(it, it))
+    else:
+        v = result
+    return cast(plan.type_, v)
+
+
+def run_plan(plan: ValidationPlan, v: Any) -> Any:
+    """
+    Validate v against a container plan, walking nested levels iteratively.
+
+    Errors behave as with the recursive validators: a failure at any depth is
+    reported as a failure to cast the top-level element that contained it.
+    """
+    # each frame is [plan, iterator over children, validated elements]
+    stack: List[List[Any]] = [[plan, _iter_children(plan, v), []]]
+    try:
+        while True:
+            frame = stack[-1]
+            item = next(frame[1], None)
+            if item is None:
+                out = _finish(frame[0], frame[2])
+                stack.pop()
+                if not stack:
+                    return out
+                stack[-1][2].append(out)
+                continue
+
+            child, v_, loc = item
+            if child.validators is not None and v_ is not None:
+                # same as `ModelField._apply_validators`, minus the error wrapping
+                field = child.field
+                try:
+                    for validator in child.validators:
+                        v_ = validator(None, v_, {}, field, field.model_config)
+                except _VALIDATION_ERRORS as e:
+                    raise CannotCastError(type=child.type_, error="") from e
+                frame[2].append(v_)
+            elif v_ is None or not child.is_container:
+                r, errors = child.field.validate(v_, {}, loc=loc)
+                if errors:
+                    raise CannotCastError(type=child.type_, error="")
+                frame[2].append(r)
+            else:
+                stack.append([child, _iter_children(child, v_), []])
+    except _VALIDATION_ERRORS as e:
+        if len(stack) > 1:
+            raise CannotCastError(type=stack[1][0].type_, error="") from e
+        raise
+
+
+def nested_casting_validator(plan: ValidationPlan) -> Callable:
+    """
+    Construct a validator for nested parametrized generics from their plan.
+
+    This replaces the element casting and simple casting validators of the
+    outermost field, so inner levels never go through `ModelField.validate`.
+    """
+
+    sub_fields = plan.field.sub_fields or []
+
+    def cast_nested(v: Any) -> Any:
+        # registered converters are trusted to build valid containers directly
+        converter = find_converter(type(v), plan.type_)
+        if converter is not None:
+            return convert(converter, plan.type_, v)
+
+        if plan.kind == MAPPING or plan.variadic:
+            sample = get_validation_sample(plan.field)
+            if sample is not None:
+                if plan.kind == MAPPING:
+                    f_key, f_val = sub_fields
+                    items = sampled_items(f_key, f_val, v, sample)
+                    record_sampled(plan.field, sample, len(items))
+                    return cast(plan.type_, items)
+                elements = sampled_elements(sub_fields[0], v, sample)
+                record_sampled(plan.field, sample, len(elements))
+                return cast(plan.type_, elements)
+        return run_plan(plan, v)
+
+    return cast_nested
@@ -0,0 +1,101 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Iterator, List, NamedTuple, Optional, Set
+
+import pydantic.fields
+
+if TYPE_CHECKING:
+    from pydantic.fields import ModelField
+
+__all__ = ["ValidationSample", "sampled_validation"]
+
+
+class ValidationSample(NamedTuple):
+    """
+    Which elements of a homogeneous container get validated.
+
+    The first `first` elements are always validated, plus `random` elements
+    picked at random among the remaining ones. All other elements are kept
+    as they are, while the container itself is still coerced.
+    """
+
+    first: int = 100
+    random: int = 0
+
+    def indices(self, n: int) -> List[int]:
+        head = min(self.first, n)
+        indices = list(range(head))
+        if self.random > 0 and n > head:
+            indices.extend(random.sample(range(head, n), min(self.random, n - head)))
+        return indices
+
+    def covers(self, n: int) -> bool:
+        """Whether all the elements of a container of length n get validated."""
+        return n <= self.first + max(self.random, 0)
+
+
+# sampling applied to every field that does not set its own, for the current call
+_call_sample: ContextVar[Optional[ValidationSample]] = ContextVar(
+    "_call_sample", default=None
+)
+# names of the fields that were sample-validated by the model being initialized
+_sampled_fields: ContextVar[Optional[Set[str]]] = ContextVar(
+    "_sampled_fields", default=None
+)
+
+
+@contextmanager
+def sampled_validation(first: int = 100, random: int = 0) -> Iterator[None]:
+    """
+    Only validate a sample of the elements of containers within this context.
+
+    Meant for large, homogeneous inputs coming from trusted producers.
+    Fields can also opt in permanently with `Field(validation_sample=...)`.
+    """
+    token = _call_sample.set(ValidationSample(first, random))
+    try:
+        yield
+    finally:
+        _call_sample.reset(token)
+
+
+def get_validation_sample(field: "ModelField") -> Optional[ValidationSample]:
+    """Return the sampling to use for a field, if any."""
+    if getattr(field, "is_sub_field", False):
+        # only the outermost container of a model field is sampled
+        return None
+    sample = field.field_info.extra.get("validation_sample")
+    if sample is None:
+        return _call_sample.get()
+    return sample  # type: ignore
+
+
+def get_call_sample() -> Optional[ValidationSample]:
+    """Return the sampling set by `sampled_validation` for the current call, if any."""
+    return _call_sample.get()
+
+
+def can_be_sampled(field: "ModelField") -> bool:
+    """Whether field is a (parametrized) container that sampling applies to."""
+    return field.shape == pydantic.fields.SHAPE_GENERIC and bool(field.sub_fields)
+
+
+def record_sampled(field: "ModelField", sample: ValidationSample, n: int) -> None:
+    """Record that field was sample-validated, if some of its n elements were not."""
+    if sample.covers(n):
+        return
+    sampled = _sampled_fields.get()
+    if sampled is not None:
+        sampled.add(field.name)
+
+
+@contextmanager
+def recording_sampled_fields() -> Iterator[Set[str]]:
+    """Collect the names of the fields sample-validated within this context."""
+    sampled: Set[str] = set()
+    token = _sampled_fields.set(sampled)
+    try:
+        yield sampled
+    finally:
+        _sampled_fields.reset(token)
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, List, Mapping, Optional, Sequence
+
+from .nested import ITERABLE, LEAF, MAPPING, TUPLE, ValidationPlan
+
+if TYPE_CHECKING:
+    from pydantic.fields import ModelField
+
+__all__ = ["UnionDiscriminator"]
+
+
+class UnionDiscriminator:
+    """
+    Pick the members of a union of generic containers worth trying for a value.
+
+    Members are classified once from their validation plan: mappings only
+    accept mapping inputs, sequence-likes only accept non-mapping iterables
+    (of the right length, for fixed arity), and container types matching the
+    input type exactly are preferred. Members that cannot be classified
+    (plain types, class validators, ...) are always kept, in their original order.
+    """
+
+    def __init__(self, members: Sequence[ModelField]) -> None:
+        self.members = list(members)
+        self.plans: List[ValidationPlan] = [
+            getattr(f, "plan", None) or ValidationPlan(LEAF, f) for f in members
+        ]
+
+    @classmethod
+    def from_field(cls, field: ModelField) -> Optional[UnionDiscriminator]:
+        """Return a discriminator for the union field, if it can help at all."""
+        if not field.sub_fields or len(field.sub_fields) < 2:
+            return None
+        discriminator = cls(field.sub_fields)
+        if not any(p.is_container for p in discriminator.plans):
+            return None
+        return discriminator
+
+    @staticmethod
+    def _accepts(plan: ValidationPlan, v: Any, is_mapping: bool) -> bool:
+        if plan.kind == MAPPING:
+            return is_mapping
+        if is_mapping or not hasattr(v, "__iter__"):
+            return False
+        if not plan.variadic and plan.kind in (TUPLE, ITERABLE):
+            try:
+                return len(v) == len(plan.children)
+            except TypeError:
+                return True
+        return True
+
+    def candidates(self, v: Any) -> Optional[List[ModelField]]:
+        """
+        Return the members to try in order, or None if all of them should be.
+
+        Strings and bytes are iterable scalars, so they are always ambiguous.
+        """
+        if isinstance(v, (str, bytes)):
+            return None
+
+        exact = [p for p in self.plans if p.is_container and p.type_ is type(v)]
+        is_mapping = isinstance(v, Mapping)
+        candidates = [
+            p.field
+            for p in self.plans
+            if not p.is_container
+            or (p in exact if exact else self._accepts(p, v, is_mapping))
+        ]
+        if not candidates or len(candidates) == len(self.members):
+            return None
+        return candidates
@@ -7,6 +7,9 @@ from typing import TYPE_CHECKING, Any, Callable, Type, TypeVar
 import pydantic.errors
 from pydantic.dataclasses import _validate_dataclass as _pydantic_validate_dataclass
 
+from .converters import find_converter
+from .sampling import ValidationSample, get_validation_sample, record_sampled
+
 if TYPE_CHECKING:
     from pydantic.fields import ModelField
 
@@ -17,26 +20,49 @@ class CannotCastError(pydantic.errors.PydanticTypeError):
     msg_template = "failed to cast value to instance of {type}:\n  {error}"
 
 
+def convert(converter: Callable, type_: Type[T], v: Any) -> T:
+    """Apply a registered converter, turning its failures into a CannotCastError."""
+    try:
+        return converter(v, type_)  # type: ignore
+    except Exception as e:
+        raise CannotCastError(
+            type=getattr(type_, "__name__", type_), error=str(e)
+        ) from e
+
+
+def cast(type_: Type[T], v: Any) -> T:
+    """
+    Coerce v to the provided type if necessary.
+
+    Uses the converter registered for the pair of types if there is one,
+    otherwise simply passes the input as a single argument to the type.
+    """
+    if isinstance(v, type_):
+        return v
+
+    converter = find_converter(type(v), type_)
+    if converter is not None:
+        return convert(converter, type_, v)
+    try:
+        return type_(v)  # type: ignore
+    except Exception as e:
+        raise CannotCastError(
+            type=getattr(type_, "__name__", type_), error=str(e)
+        ) from e
+
+
 def simple_casting_validator(type_: Type[T]) -> Callable:
     """
     Construct a validator which coerces to the provided type if necessary.
 
-    Coercion is done by simply passing the input as a single argument to the type.
+    Coercion is done by simply passing the input as a single argument to the type,
+    unless a converter was registered with `register_converter`.
     If more complex logic is needed, a class validator should be implemented,
     which will be called before this validator making it a noop.
     """
 
     def arbitrary_type_validator(v: Any) -> T:
-        if isinstance(v, type_):
-            return v
-
-        # cast
-        try:
-            return type_(v)  # type: ignore
-        except Exception as e:
-            raise CannotCastError(
-                type=getattr(type_, "__name__", type_), error=str(e)
-            ) from e
+        return cast(type_, v)
 
     return arbitrary_type_validator
 
@@ -45,6 +71,34 @@ class Missing:
     pass
 
 
+def sampled_elements(f: ModelField, v: Any, sample: ValidationSample) -> list:
+    """Validate a sample of the elements of v, keeping the others as they are."""
+    result = list(v)
+    for i in sample.indices(len(result)):
+        r, e = f.validate(result[i], {}, loc=i)
+        if e:
+            raise CannotCastError(type=f.type_, error="")
+        result[i] = r
+    return result
+
+
+def sampled_items(
+    f_key: ModelField, f_val: ModelField, v: Any, sample: ValidationSample
+) -> dict:
+    """Validate a sample of the items of v, keeping the others as they are."""
+    items = list(v.items())
+    for i in sample.indices(len(items)):
+        k_, v_ = items[i]
+        k, e = f_key.validate(k_, {}, loc=i)
+        if e:
+            raise CannotCastError(type=f_key.type_, error="")
+        v_, e = f_val.validate(v_, {}, loc=i)
+        if e:
+            raise CannotCastError(type=f_val.type_, error="")
+        items[i] = (k, v_)
+    return dict(items)
+
+
 def tuple_element_casting_validator(field: ModelField) -> Callable:
     """
     Construct a validator for parametrized sequence-like objects
@@ -57,9 +111,19 @@ def tuple_element_casting_validator(field: ModelField) -> Callable:
         if not field.sub_fields:
             return v
 
+        # registered converters are trusted to build valid containers directly
+        converter = find_converter(type(v), field.type_)
+        if converter is not None:
+            return convert(converter, field.type_, v)
+
         result = []
         if len(field.sub_fields) == 2 and field.sub_fields[1].type_ is type(Ellipsis):
             f = field.sub_fields[0]
+            sample = get_validation_sample(field)
+            if sample is not None:
+                result = sampled_elements(f, v, sample)
+                record_sampled(field, sample, len(result))
+                return result
             for i, v_ in enumerate(v):
                 r, e = f.validate(v_, {}, loc=i)
                 if e:
@@ -95,9 +159,19 @@ def element_casting_validator(field: ModelField) -> Callable:
         if not field.sub_fields:
             return v
 
+        # registered converters are trusted to build valid containers directly
+        converter = find_converter(type(v), field.type_)
+        if converter is not None:
+            return convert(converter, field.type_, v)
+
         result = []
         if len(field.sub_fields) == 1:
             f = field.sub_fields[0]
+            sample = get_validation_sample(field)
+            if sample is not None:
+                result = sampled_elements(f, v, sample)
+                record_sampled(field, sample, len(result))
+                return result
             for i, v_ in enumerate(v):
                 r, e = f.validate(v_, {}, loc=i)
                 if e:
@@ -131,9 +205,21 @@ def mapping_casting_validator(field: ModelField) -> Callable:
         if not field.sub_fields:
             return v
 
+        # registered converters are trusted to build valid containers directly
+        converter = find_converter(type(v), field.type_)
+        if converter is not None:
+            return convert(converter, field.type_, v)
+
         if len(field.sub_fields) != 2:
             raise ValueError("must pass 2 fields to mapping")
 
+        sample = get_validation_sample(field)
+        if sample is not None:
+            f_key, f_val = field.sub_fields
+            sampled = sampled_items(f_key, f_val, v, sample)
+            record_sampled(field, sample, len(sampled))
+            return sampled
+
         result = {}
         for i, (k_, v_) in enumerate(v.items()):
             f_key = field.sub_fields[0]
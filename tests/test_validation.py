@@ -1,4 +1,10 @@
+import dataclasses
+import gc
+import math
+import pickle
 import sys
+import weakref
+from decimal import Decimal
 from typing import (
     Any,
     Callable,
@@ -22,11 +28,23 @@ from typing import (
 )
 
 import pytest
+from pydantic import Field, validator
 from pydantic.color import Color
 from pydantic.dataclasses import dataclass
 from pydantic.error_wrappers import ValidationError
 
-from extra_pydantic import BaseModel, create_model
+from extra_pydantic import (
+    BaseModel,
+    ModelCache,
+    ValidationSample,
+    cached_create_model,
+    create_model,
+    register_converter,
+    sampled_validation,
+    unregister_converter,
+)
+from extra_pydantic.converters import find_converter
+from extra_pydantic.fields import _GENERIC_VALIDATORS, validator_index
 
 T = TypeVar("T")
 U = TypeVar("U")
@@ -425,3 +443,435 @@ def test_color():
     m = M(c="red")
     assert isinstance(m.c, Color)
     assert m.c.as_named() == "red"
+
+
+def test_deeply_nested_generics():
+    field: Any = MyTuple[int, ...]
+    value: Any = [1, "2"]
+    for i in range(12):
+        field = MyList[field] if i % 2 else MyMutableMapping[str, field]
+        value = [value] if i % 2 else {i: value}
+    Model = create_model("Model", x=(field, ...), __config__=Config)
+    assert Model.__fields__["x"].plan.depth == 13
+
+    attr = Model(x=value).x
+    for i in reversed(range(12)):
+        assert isinstance(attr, MyList if i % 2 else MyMutableMapping)
+        attr = attr.v[0] if i % 2 else attr.v[str(i)]
+    assert isinstance(attr, MyTuple)
+    assert attr.v == (1, 2)
+
+    inner: Any = value
+    for i in reversed(range(12)):
+        inner = inner[0] if i % 2 else inner[i]
+    inner.append("a")
+    with pytest.raises(ValidationError, match="instance of <class"):
+        Model(x=value)
+
+
+def test_cached_create_model():
+    cached_create_model.cache_clear()
+
+    class Config2:
+        arbitrary_types_allowed = True
+
+    Model = cached_create_model("Model", x=(MyList[int], [1]), __config__=Config)
+    assert issubclass(Model, BaseModel)
+    assert Model(x=["1"]).x.v == [1]
+    assert (
+        cached_create_model("Model", x=(MyList[int], [1]), __config__=Config2) is Model
+    )
+    assert (
+        cached_create_model("Model", x=(MyList[int], [1.0]), __config__=Config)
+        is not Model
+    )
+    assert (
+        cached_create_model("Model", x=(MyList[str], [1]), __config__=Config)
+        is not Model
+    )
+    assert cached_create_model.cache_info() == (1, 3, 128, 3)
+
+
+def test_model_cache_canonical_form():
+    from pydantic import BaseConfig
+
+    def make_config():
+        class Config(BaseConfig):
+            arbitrary_types_allowed = True
+
+        return Config
+
+    cache = ModelCache()
+    a = cache.create_model(
+        "A", x=(int, Field(1, description="d")), __config__=make_config()
+    )
+    b = cache.create_model(
+        "A", x=(int, Field(1, description="d")), __config__=make_config()
+    )
+    c = cache.create_model(
+        "A", x=(int, Field(1, description="e")), __config__=make_config()
+    )
+    assert a is b
+    assert c is not a
+    assert cache.cache_info()[:2] == (1, 2)
+
+
+def test_model_cache_eviction():
+    cache = ModelCache(maxsize=2)
+    a = cache.create_model("A", x=(int, ...), __config__=Config)
+    cache.create_model("B", x=(int, ...), __config__=Config)
+    cache.create_model("C", x=(int, ...), __config__=Config)
+    assert cache.cache_info().currsize == 2
+    # evicted, but still alive, so it is reused
+    assert cache.create_model("A", x=(int, ...), __config__=Config) is a
+    assert cache.cache_info() == (1, 3, 2, 2)
+
+
+def test_registered_converter():
+    class Source:
+        def __iter__(self):
+            raise AssertionError("should not be iterated")
+
+    class SubSource(Source):
+        pass
+
+    @register_converter(Source, MyList)
+    def source_to_list(v, type_):
+        return type_([1, 2])
+
+    try:
+        Model = create_model("Model", x=(MyValidatingList, ...), __config__=Config)
+        # resolved along the mro of both source and target
+        assert find_converter(SubSource, MyValidatingList) is source_to_list
+        attr = Model(x=SubSource()).x
+        assert type(attr) is MyValidatingList
+        assert attr.v == [1, 2]
+        # other pairs are still casted
+        assert find_converter(list, MyValidatingList) is None
+        assert Model(x=[3]).x.v == [3]
+        # dynamically created types are not kept alive by the dispatch cache
+        Dynamic = type("Dynamic", (), {})
+        assert find_converter(Dynamic, MyValidatingList) is None
+        ref = weakref.ref(Dynamic)
+        del Dynamic
+        gc.collect()
+        assert ref() is None
+    finally:
+        unregister_converter(Source, MyList)
+    assert find_converter(SubSource, MyValidatingList) is None
+
+
+@pytest.mark.parametrize(
+    "field, converted",
+    [
+        (MyList[float], [1.0]),
+        (MyTuple[float, ...], (1.0,)),
+        (MyMutableMapping[str, float], {"a": 1.0}),
+        (MyList[MyList[float]], [1.0]),
+    ],
+)
+def test_registered_converter_parametrized(field: type, converted: Any) -> None:
+    class Array:
+        def __iter__(self):
+            raise AssertionError("should not be iterated")
+
+        def items(self):
+            raise AssertionError("should not be iterated")
+
+    calls = []
+
+    @register_converter(Array, get_origin(field))
+    def array_to_container(v, type_):
+        calls.append(v)
+        return type_(converted)
+
+    try:
+        Model = create_model("Model", x=(field, ...), __config__=Config)
+        attr = Model(x=Array()).x
+        assert type(attr) is get_origin(field)
+        assert attr.v == converted
+        assert len(calls) == 1
+    finally:
+        unregister_converter(Array, get_origin(field))
+
+
+@pytest.mark.parametrize(
+    "field, value, expected",
+    [
+        (MyList[int], ["1", "2", "3", "a"], [1, 2, "3", "a"]),
+        (MyTuple[int, ...], ["1", "2", "3", "a"], (1, 2, "3", "a")),
+        (
+            MyMutableMapping[int, int],
+            {"1": "1", "2": "2", "3": "3", "a": "a"},
+            {1: 1, 2: 2, "3": "3", "a": "a"},
+        ),
+        (
+            MyList[MyList[int]],
+            [["1"], ["2"], ["3"], ["a"]],
+            [MyList([1]), MyList([2]), ["3"], ["a"]],
+        ),
+    ],
+)
+def test_sampled_validation(field: type, value: Any, expected: Any) -> None:
+    Model = create_model("Model", x=(field, ...), __config__=Config)
+    with pytest.raises(ValidationError):
+        Model(x=value)
+
+    with sampled_validation(first=2):
+        instance = Model(x=value)
+    assert type(instance.x) is get_origin(field)
+    # sampled elements are validated, the others are kept as they are
+    assert instance.x.v == expected
+    assert instance.__sampled_fields__ == {"x"}
+
+    with sampled_validation(first=0, random=4), pytest.raises(ValidationError):
+        Model(x=value)
+
+
+def test_field_sampled_validation():
+    class M(BaseModel):
+        Config = Config
+        x: MyList[float] = Field(..., validation_sample=ValidationSample(first=1))
+        y: MyList[float]
+
+    m = M(x=["1", "a"], y=["1"])
+    assert m.x.v == [1.0, "a"]
+    assert m.y.v == [1.0]
+    assert m.__sampled_fields__ == {"x"}
+    assert m.copy().__sampled_fields__ == {"x"}
+
+
+def test_sampled_fields_recording():
+    class M(BaseModel):
+        class Config:
+            arbitrary_types_allowed = True
+            validate_assignment = True
+
+        x: MyList[float]
+
+    # all the elements were validated
+    with sampled_validation(first=2):
+        m = M(x=["1", "2"])
+    assert m.__sampled_fields__ == frozenset()
+
+    with sampled_validation(first=1):
+        m.x = ["1", "a"]
+    assert m.x.v == [1.0, "a"]
+    assert m.__sampled_fields__ == {"x"}
+    m.x = ["1", "2"]
+    assert m.__sampled_fields__ == frozenset()
+
+    # models without containers never record anything
+    class N(BaseModel):
+        Config = Config
+        a: int
+
+    assert "__sampled_fields__" not in N.__private_attributes__
+    with sampled_validation(first=1):
+        assert N(a=1).__sampled_fields__ == frozenset()
+    with pytest.raises(AttributeError):
+        N(a=1).b
+
+
+def test_validator_index():
+    n_generic = len(_GENERIC_VALIDATORS)
+    assert _GENERIC_VALIDATORS[validator_index(MyMutableMapping)][0] is Mapping
+    assert _GENERIC_VALIDATORS[validator_index(MyTuple)][0] is Tuple
+    assert _GENERIC_VALIDATORS[validator_index(MyList)][0] is Iterable
+    assert _GENERIC_VALIDATORS[validator_index(MyGeneric)][0] is Generic
+    # bool must resolve before int, as in pydantic's table
+    assert validator_index(bool) < validator_index(int)
+    assert validator_index(int) >= n_generic
+    assert validator_index(FollowsProtocol) == -1
+    assert validator_index(Literal[1]) is None
+
+
+@dataclasses.dataclass
+class MyStdlibDataClass:
+    a: int
+    b: float
+
+
+def test_validator_index_nested_fields():
+    # the fields of stdlib dataclasses are created while the table is patched
+    class M(BaseModel):
+        Config = Config
+        d: MyStdlibDataClass
+
+    assert M(d={"a": "1", "b": "2.5"}).d == MyStdlibDataClass(a=1, b=2.5)
+
+
+def test_validator_index_does_not_leak():
+    Inner = create_model("Inner", a=(int, 1), __config__=Config)
+    create_model("Outer", i=(Inner, ...), __config__=Config)
+    ref = weakref.ref(Inner)
+    del Inner
+    gc.collect()
+    assert ref() is None
+
+
+class MyFrozenTuple(Tuple[T, ...]):
+    __slots__ = ()
+
+
+def test_validation_cache():
+    class M(BaseModel):
+        Config = Config
+        x: MyFrozenTuple[int, ...] = Field(..., validation_cache=2)
+        y: MyList[int] = Field(..., validation_cache=2)
+
+    cache = M.__fields__["x"].validation_cache
+    assert cache is not None
+    # disabled for mutable types
+    assert M.__fields__["y"].validation_cache is None
+
+    a = M(x=("1", 2), y=[1]).x
+    assert type(a) is MyFrozenTuple
+    assert a == (1, 2)
+    assert M(x=("1", 2), y=[1]).x is a
+    # equal but differently typed inputs are cached separately
+    assert M(x=(1, 2), y=[1]).x is not a
+    # unhashable inputs bypass the cache
+    assert M(x=["1", 2], y=[1]).x == a
+    with pytest.raises(ValidationError):
+        M(x=("a",), y=[1])
+
+    info = cache.cache_info()
+    assert info[:4] == (1, 3, 2, 2)
+    assert info.hit_rate == 0.25
+
+
+def test_validation_cache_exact_numbers():
+    class M(BaseModel):
+        Config = Config
+        x: float = Field(..., validation_cache=8)
+        y: Decimal = Field(..., validation_cache=8)
+
+    assert M(x=0.0, y=Decimal("1.0")).y == Decimal("1.0")
+    m = M(x=-0.0, y=Decimal("1.00"))
+    assert str(m.x) == "-0.0"
+    assert str(m.y) == "1.00"
+    assert math.isnan(M(x=math.nan, y=0).x)
+    assert math.isnan(M(x=math.nan, y=0).x)
+    assert M.__fields__["x"].validation_cache.cache_info().hits == 1
+
+
+def test_validation_cache_inheritance():
+    class A(BaseModel):
+        Config = Config
+        x: MyFrozenTuple[int, ...] = Field(..., validation_cache=8)
+
+    class B(A):
+        pass
+
+    class C(A):
+        @validator("x")
+        def check_x(cls, v):
+            return v
+
+    # the copied field keeps using the same cache, unless validators were added
+    assert B.__fields__["x"].validation_cache is A.__fields__["x"].validation_cache
+    assert C.__fields__["x"].validation_cache is None
+    assert B(x=("1",)).x is A(x=("1",)).x
+
+    D = create_model("D", __base__=A, y=(int, 0))
+    assert D(x=("1",)).x == (1,)
+
+
+UNION = Union[MyList[int], MyMutableMapping[str, int], MyTripleTuple[int, int, int]]
+
+
+@pytest.mark.parametrize(
+    "field, value, expected",
+    [
+        # ordered trial would cast the keys to a MyList
+        (UNION, {1: "2"}, MyMutableMapping({"1": 2})),
+        # fixed arity tuple
+        (UNION, [1, "2", 3], MyList([1, 2, 3])),
+        (
+            Union[MyTripleTuple[int, int, int], MyList[int]],
+            [1, "2", 3],
+            MyTripleTuple((1, 2, 3)),
+        ),
+        (Union[MyTripleTuple[int, int, int], MyList[int]], [1, "2"], MyList([1, 2])),
+        # exact container type
+        (Union[MyList[str], MyTuple[int, ...]], MyTuple([1]), MyTuple((1,))),
+        # leaves are always kept, strings are ambiguous
+        (Union[int, MyList[int]], "1", 1),
+        (Union[MyList[int], str], "12", MyList([1, 2])),
+        (Optional[Union[MyList[int], MyMutableMapping[str, int]]], None, None),
+    ],
+)
+def test_union_discrimination(field: type, value: Any, expected: Any) -> None:
+    Model = create_model("Model", x=(field, ...), __config__=Config)
+    attr = Model(x=value).x
+    assert attr == expected
+    assert type(attr) is type(expected)
+
+
+def test_union_discrimination_fallback():
+    Model = create_model("Model", x=(UNION, ...), __config__=Config)
+    assert Model.__fields__["x"].union_discriminator is not None
+    # no member succeeds, so all of them are tried
+    with pytest.raises(ValidationError) as e:
+        Model(x={"a": "b"})
+    assert len(e.value.errors()) == 3
+
+
+class CopiedModel(BaseModel):
+    Config = Config
+    x: MyList[MyMutableMapping[str, int]]
+    y: Tuple[int, ...] = ()
+    z: MyFrozenTuple[str, ...] = MyFrozenTuple(())
+
+
+def test_pickle_without_validation():
+    m = CopiedModel(x=[{"a": "1"}])
+    restored = pickle.loads(pickle.dumps(m))
+    assert type(restored) is CopiedModel
+    assert restored.x.v == [MyMutableMapping({"a": 1})]
+    assert restored.__fields_set__ == {"x"}
+
+    # values are restored as they are
+    invalid = CopiedModel.construct(x="not validated")
+    assert pickle.loads(pickle.dumps(invalid)).x == "not validated"
+
+
+def test_deep_copy_shares_immutable_values():
+    assert CopiedModel.__shared_on_copy__ == {"y", "z"}
+    m = CopiedModel(x=[{"a": "1"}], y=[1, 2], z=["a"])
+    copy = m.copy(deep=True)
+    assert copy == m
+    assert list(copy.__dict__) == ["x", "y", "z"]
+    assert copy.y is m.y
+    assert copy.z is m.z
+    assert copy.x is not m.x
+
+    # copies stay independent
+    m.x.v.append(1)
+    assert copy.x.v == [MyMutableMapping({"a": 1})]
+
+    # values passed with update are not validated, so still copied
+    update = [1]
+    assert m.copy(update={"y": update}, deep=True).y is not update
+
+
+def test_validation_cache_with_sampling():
+    class M(BaseModel):
+        Config = Config
+        x: MyFrozenTuple[int, ...] = Field(..., validation_cache=8)
+
+    cache = M.__fields__["x"].validation_cache
+    with sampled_validation(first=1):
+        m = M(x=("1", "a"))
+    assert m.x == (1, "a")
+    assert m.__sampled_fields__ == {"x"}
+    assert cache.cache_info().currsize == 0
+
+    # the partially validated result must not be served to full validation
+    with pytest.raises(ValidationError):
+        M(x=("1", "a"))
+    assert M(x=("1", "2")).x == (1, 2)
+    with sampled_validation(first=1):
+        assert M(x=("1", "2")).__sampled_fields__ == {"x"}
+    assert cache.cache_info()[:2] == (0, 2)